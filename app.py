@@ -1,12 +1,42 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+import csv
 import json
 import time
 import io
-from typing import Tuple, Optional, List, Dict, Any
+import os
+import hashlib
+import tempfile
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Tuple, Optional, List, Dict, Any, Iterator
 import logging
+import threading
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
+
+# Optional faster JSON parser; orjson errors subclass json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Optional fast non-cryptographic hash for upload cache keys
+try:
+    import xxhash
+    def _content_digest(data: bytes) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+except ImportError:
+    def _content_digest(data: bytes) -> str:
+        return hashlib.md5(data).hexdigest()
 
 # ========================================
 # CONFIGURATION & CONSTANTS
@@ -24,12 +54,32 @@ PAGE_CONFIG = {
 API_CONFIG = {
     "base_url": "https://emailverifier.reoon.com/api/v1/verify",
     "timeout": 30,
-    "delay_between_requests": 0.3
+    "requests_per_minute": 200,
+    "max_workers": 16,
+    "pool_size": 64,
+    "max_retries": 3,
+    "retry_backoff_factor": 0.3,
+    "retry_status_codes": (429, 500, 502, 503, 504)
 }
 
 # Email validation
 EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 
+# Precompiled pattern for the per-row hot path
+_EMAIL_RE = re.compile(EMAIL_REGEX, re.ASCII)
+
+# Translation table deleting every ASCII character outside a-z
+_NON_LOWER_ASCII = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not 97 <= c <= 122))
+
+# Email local-part templates in default priority order (jdoe, john, john.doe, ...)
+EMAIL_PATTERNS = (
+    "{f}{last}", "{first}", "{first}.{last}", "{last}", "{f}{l}", "{first}{last}",
+    "{first}{l}", "{last}{f}", "{last}.{f}", "{last}{first}", "{first}_{last}"
+)
+
+# Extra templates tried only when a middle name is present (jml, john.m.doe, jmdoe)
+EMAIL_MIDDLE_PATTERNS = ("{f}{m}{l}", "{first}.{m}.{last}", "{f}{m}{last}")
+
 # Required field mapping
 REQUIRED_FIELDS = {
     'firstname': 'First Name',
@@ -38,7 +88,60 @@ REQUIRED_FIELDS = {
 }
 
 # Status mappings
-FORBIDDEN_EMAIL_STATUSES = ["invalid", "disabled", "unknown"]
+FORBIDDEN_EMAIL_STATUSES = frozenset({"invalid", "disabled", "unknown"})
+# Statuses that may change on a retry (greylisting, timeouts) and are never cached
+TRANSIENT_EMAIL_STATUSES = frozenset({"unknown"})
+
+# In-process memoization sizes
+CACHE_CONFIG = {
+    "domain_cache_size": 4096,
+    "email_cache_size": 50000,
+    # Persistent results are opt-in per deployment; unset keeps results in memory only
+    "result_db_path": os.environ.get("EMAIL_VERIFIER_RESULT_DB"),
+    "found_ttl_seconds": 30 * 86400,
+    "not_found_ttl_seconds": 86400,
+    # A domain is skipped only after this many people hit "mail not accepted" on it,
+    # and only for this long, so one transient MX failure cannot sink a whole company
+    "dead_domain_strikes": 3,
+    "dead_domain_ttl_seconds": 3600
+}
+
+# Column auto-detection
+DETECTION_CONFIG = {
+    "sample_rows": 200,
+    "min_score": 0.5,
+    # Values containing '@' are email addresses, not company sites
+    "url_pattern": r'^(?!.*@)(?:https?://|www\.|.*\.[a-z]{2,}(?:/|$))',
+    # Added to a column's score when its header names a site, so ties go to e.g. "Website"
+    "header_bonus": 0.1,
+    "name_pattern": r"^[A-Za-z][A-Za-z'\- ]*$",
+    "header_hints": {
+        'firstname': ('first', 'fname', 'given'),
+        'lastname': ('last', 'lname', 'surname', 'family'),
+        'companyURL': ('url', 'website', 'domain', 'company', 'site')
+    }
+}
+
+# CSV parsing
+CSV_CONFIG = {
+    "fallback_encodings": ("utf-8", "cp1252", "latin-1"),
+    "string_dtype": "string[pyarrow]",
+    # Bump whenever parsing changes so cached frames from the old reader are not reused
+    "reader_version": 2,
+    # Parsed uploads contain personal data, so the on-disk copy is opt-in per deployment
+    "parquet_cache_dir": os.environ.get("EMAIL_VERIFIER_UPLOAD_CACHE_DIR"),
+    "parquet_cache_max_age_seconds": 86400,
+    "parquet_cache_max_bytes": 512 * 1024 * 1024,
+    # Parsed frames kept in process memory; bounded for the same reason as the parquet copies
+    "memory_cache_max_entries": 16,
+    "memory_cache_ttl_seconds": 3600
+}
+
+# Streamlit rendering
+UI_CONFIG = {
+    "progress_update_seconds": 0.5,
+    "analytics_default_max_rows": 1000
+}
 
 # ========================================
 # LOGGING SETUP
@@ -191,7 +294,11 @@ def validate_email(email: str) -> bool:
     """Validate email format."""
     if not email or not isinstance(email, str):
         return False
-    return bool(re.match(EMAIL_REGEX, email.strip()))
+    email = email.strip()
+    # Cheap rejections before running the regex
+    if '@' not in email or ' ' in email or len(email) > 254:
+        return False
+    return _EMAIL_RE.match(email) is not None
 
 def validate_api_key(api_key: str) -> bool:
     """Validate API key format."""
@@ -199,7 +306,7 @@ def validate_api_key(api_key: str) -> bool:
         return False
     return len(api_key.strip()) > 10
 
-def validate_column_mapping(column_mapping: Dict[str, str], df_columns: List[str]) -> Tuple[bool, List[str]]:
+def validate_column_mapping(column_mapping: Dict[str, str], df_columns: pd.Index) -> Tuple[bool, List[str]]:
     """Validate that all required fields are mapped to valid columns."""
     errors = []
     
@@ -216,26 +323,161 @@ def validate_column_mapping(column_mapping: Dict[str, str], df_columns: List[str
     
     return len(errors) == 0, errors
 
+# ========================================
+# RATE LIMITING
+# ========================================
+
+class RateLimiter:
+    """Sliding-window request limiter shared by all verification workers."""
+    
+    def __init__(self, max_requests_per_minute: int):
+        self.max_requests = max_requests_per_minute
+        self.window_seconds = 60.0
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block only while the rolling one-minute window is full."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._timestamps and now - self._timestamps[0] >= self.window_seconds:
+                    self._timestamps.popleft()
+                if len(self._timestamps) < self.max_requests:
+                    self._timestamps.append(now)
+                    return
+                wait = self._timestamps[0] + self.window_seconds - now
+            time.sleep(wait)
+
+@st.cache_resource
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter so every session and tab shares one API quota."""
+    return RateLimiter(API_CONFIG['requests_per_minute'])
+
+# ========================================
+# PERSISTENT RESULT CACHE
+# ========================================
+
+class ResultStore:
+    """SQLite-backed (firstname, lastname, domain) -> result cache that survives restarts."""
+    
+    def __init__(self, path: Optional[str]):
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        if not path:
+            return
+        try:
+            # Results hold personal data: create the file readable by this user only
+            os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+            os.chmod(path, 0o600)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results "
+                    "(key TEXT PRIMARY KEY, result TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Result cache unavailable at {path}, continuing without it: {e}")
+    
+    @staticmethod
+    def make_key(api_key: str, firstname: str, lastname: str, domain: str) -> str:
+        """Case-insensitive key for one person at one company, scoped to one API key."""
+        raw = f"{api_key}|{firstname.lower()}|{lastname.lower()}|{domain.lower()}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result for key unless it is missing or expired."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT result FROM results WHERE key = ? AND expires_at > ?", (key, time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache read failed: {e}")
+            return None
+        return _json_loads(row[0]) if row else None
+    
+    def set(self, key: str, result: Dict[str, Any], ttl_seconds: float):
+        """Store result for key, replacing any earlier entry."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, result, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), time.time() + ttl_seconds)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache write failed: {e}")
+
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    """Return the process-wide result cache shared by every session."""
+    return ResultStore(CACHE_CONFIG['result_db_path'])
+
 # ========================================
 # CORE EMAIL VERIFICATION FUNCTIONS
 # ========================================
 
+def _keep_lowercase_letters(value: str) -> str:
+    """Drop everything except a-z (same result as re.sub(r'[^a-z]', '', value))."""
+    if not value.isascii():
+        value = value.encode('ascii', 'ignore').decode('ascii')
+    return value.translate(_NON_LOWER_ASCII)
+
 class EmailVerifier:
     """Core email verification functionality."""
     
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self._api_params = {'key': api_key, 'mode': 'power'}
         self.session = requests.Session()
+        retry = Retry(
+            total=API_CONFIG['max_retries'],
+            backoff_factor=API_CONFIG['retry_backoff_factor'],
+            status_forcelist=API_CONFIG['retry_status_codes'],
+            respect_retry_after_header=True
+        )
+        # Never give workers fewer pooled connections than there are workers
+        self.pool_size = max(API_CONFIG['pool_size'], API_CONFIG['max_workers'])
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=retry
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Reuse pooled connections and let the API compress its JSON replies
+        self.session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': 'gzip, deflate'})
+        self.rate_limiter = get_rate_limiter()
+        self.result_store = get_result_store()
+        self._email_cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._pattern_wins: Dict[str, Counter] = defaultdict(Counter)
+        self._global_pattern_wins: Counter = Counter()
+        self._dead_domain_strikes: Counter = Counter()
+        self._dead_domains: Dict[str, float] = {}
         
-    def clean_domain(self, domain_raw: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=CACHE_CONFIG['domain_cache_size'])
+    def clean_domain(domain_raw: str) -> str:
         """Clean and normalize domain name."""
         if not isinstance(domain_raw, str) or not domain_raw.strip():
             return ""
         
-        domain = re.sub(r'^https?://', '', domain_raw.strip(), flags=re.IGNORECASE)
-        domain = re.sub(r'^www\.', '', domain, flags=re.IGNORECASE)
-        domain = domain.split('/')[0]
-        return domain.strip().lower()
+        # Lowercase first so plain prefix checks cover any scheme/www casing
+        domain = domain_raw.strip().lower()
+        if domain.startswith('https://'):
+            domain = domain[8:]
+        elif domain.startswith('http://'):
+            domain = domain[7:]
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        return domain.split('/', 1)[0].strip()
     
     def parse_name(self, full_name: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """Parse full name into first, middle, last components."""
@@ -256,10 +498,11 @@ class EmailVerifier:
             last_name = parts[-1].lower()
 
         # Clean names
-        first_name = re.sub(r'[^a-z]', '', first_name)
-        last_name = re.sub(r'[^a-z]', '', last_name)
+        first_name = _keep_lowercase_letters(first_name)
+        last_name = _keep_lowercase_letters(last_name)
         if middle_name: 
-            middle_name = re.sub(r'[^a-z]', '', middle_name)
+            # A middle part with no letters left (e.g. "-") means no middle name
+            middle_name = _keep_lowercase_letters(middle_name) or None
 
         if len(parts) == 1 and first_name: 
             last_name = first_name
@@ -268,56 +511,60 @@ class EmailVerifier:
 
         return first_name, middle_name, last_name
     
-    def generate_email_formats(self, first_name: str, middle_name: Optional[str], last_name: str, domain: str) -> List[str]:
-        """Generate potential email formats based on name components."""
-        potential_locals = []
-        f = first_name[0] if first_name else ''
-        m = middle_name[0] if middle_name else ''
-        l = last_name[0] if last_name else ''
-
-        # Generate various email format patterns
-        patterns = [
-            f"{f}{last_name}",  # jdoe
-            f"{first_name}",  # john
-            f"{first_name}.{last_name}",  # john.doe
-            f"{last_name}",  # doe
-            f"{f}{l}",  # jd
-            f"{first_name}{last_name}",  # johndoe
-            f"{first_name}{l}",  # johnd
-            f"{last_name}{f}",  # doej
-            f"{last_name}.{f}",  # doe.j
-            f"{last_name}{first_name}",  # doejohn
-            f"{first_name}_{last_name}",  # john_doe
-        ]
-        
-        # Add middle name patterns if available
-        if middle_name:
-            patterns.extend([
-                f"{f}{m}{l}",  # jml
-                f"{first_name}.{m}.{last_name}",  # john.m.doe
-                f"{f}{m}{last_name}",  # jmdoe
-            ])
-
-        # Filter and deduplicate
-        potential_locals = [pattern for pattern in patterns if pattern and len(pattern) > 0]
-        generated_emails = list(dict.fromkeys([f"{local_part}@{domain}" for local_part in potential_locals]))
-        
-        return generated_emails
+    @staticmethod
+    def iter_email_formats(first_name: str, middle_name: Optional[str], last_name: str,
+                           domain: str, patterns: Tuple[str, ...]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield unique (pattern, email) candidates so formatting stops at the first hit."""
+        # One mapping per person; format_map skips the kwargs unpacking str.format does per call
+        fields = {
+            'first': first_name,
+            'last': last_name,
+            'f': first_name[:1],
+            'm': middle_name[:1] if middle_name else '',
+            'l': last_name[:1]
+        }
+        
+        seen = set()
+        for pattern in patterns:
+            local_part = pattern.format_map(fields)
+            if local_part and local_part not in seen:
+                seen.add(local_part)
+                yield pattern, f"{local_part}@{domain}"
     
     def verify_email_api(self, email: str) -> Dict[str, Any]:
-        """Call the Reoon Email Verifier API."""
-        api_url = f"{API_CONFIG['base_url']}?email={email}&key={self.api_key}&mode=power"
+        """Call the Reoon Email Verifier API, reusing earlier answers for the same email."""
+        cached = self._email_cache.get(email)
+        if cached is not None:
+            return {**cached, 'cached': True}
         
         try:
-            response = self.session.get(api_url, timeout=API_CONFIG['timeout'])
+            self.rate_limiter.acquire()
+            # Let requests percent-encode the query so addresses with '+' survive
+            response = self.session.get(
+                API_CONFIG['base_url'],
+                params={'email': email, **self._api_params},
+                timeout=API_CONFIG['timeout']
+            )
             response.raise_for_status()
-            return response.json()
+            result = _json_loads(response.content)
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed for {email}: {e}")
             return {"error": f"API Request Failed: {e}"}
         except json.JSONDecodeError as e:
             logger.error(f"Failed to decode API response for {email}: {e}")
             return {"error": "Failed to decode API response"}
+        
+        # Only definitive answers are cached so failures and "unknown" are retried;
+        # keep just the status to bound memory across large batches
+        if 'error' not in result and result.get('status', 'unknown') not in TRANSIENT_EMAIL_STATUSES:
+            with self._cache_lock:
+                if len(self._email_cache) >= CACHE_CONFIG['email_cache_size']:
+                    self._email_cache.pop(next(iter(self._email_cache)))
+                self._email_cache[email] = {
+                    'status': result.get('status', 'unknown'),
+                    'mx_accepts_mail': result.get('mx_accepts_mail')
+                }
+        return result
     
     def verify_single_email(self, firstname: str, lastname: str, company_url: str) -> Optional[Dict[str, Any]]:
         """Verify email for a single person, stopping when valid email is found."""
@@ -333,25 +580,54 @@ class EmailVerifier:
         if not first or not last:
             return None
         
-        # Generate email formats
-        email_formats = self.generate_email_formats(first, middle, last, domain)
+        # Reuse an earlier answer for this person, from this or a previous session
+        store_key = ResultStore.make_key(self.api_key, firstname, lastname, domain)
+        stored = self.result_store.get(store_key)
+        if stored is not None:
+            return {**stored, 'firstname': firstname, 'lastname': lastname, 'cached': True, 'api_calls': 0}
+        
+        # Order templates by wins on this domain, then by wins across all domains;
+        # the stable sort keeps the default order for ties
+        patterns = EMAIL_PATTERNS + EMAIL_MIDDLE_PATTERNS if middle else EMAIL_PATTERNS
+        domain_wins = self._pattern_wins.get(domain, Counter())
+        global_wins = self._global_pattern_wins
+        if domain_wins or global_wins:
+            patterns = sorted(patterns, key=lambda pattern: (-domain_wins[pattern], -global_wins[pattern]))
         
         # Track testing progress
         formats_tested = []
+        api_calls = 0
+        lookup_failed = False
+        stopped_on_mx = False
+        
+        # Candidates are built on demand; a domain whose mail servers accept nothing gets none
+        if self._is_dead_domain(domain):
+            candidates = ()
+        else:
+            candidates = self.iter_email_formats(first, middle, last, domain, patterns)
         
         # Test each format until we find a valid one
-        for i, email in enumerate(email_formats):
+        for pattern, email in candidates:
+            # Malformed addresses (e.g. a domain without a TLD) can never verify; skip the API call
+            if not validate_email(email):
+                continue
             formats_tested.append(email)
             
             try:
                 result = self.verify_email_api(email)
+                if not result.get('cached'):
+                    api_calls += 1
                 
                 if result and 'error' not in result:
                     status = result.get("status", "unknown")
                     
                     # If status is valid (not in forbidden list), return immediately
                     if status not in FORBIDDEN_EMAIL_STATUSES:
-                        return {
+                        with self._cache_lock:
+                            self._pattern_wins[domain][pattern] += 1
+                            self._global_pattern_wins[pattern] += 1
+                            self._dead_domain_strikes.pop(domain, None)
+                        found = {
                             'firstname': firstname,
                             'lastname': lastname,
                             'company': domain,
@@ -359,21 +635,32 @@ class EmailVerifier:
                             'status': status,
                             'full_name': full_name,
                             'formats_tested': formats_tested,
-                            'total_formats_available': len(email_formats),
+                            # Distinct well-formed addresses: those tried plus the untried rest
+                            'total_formats_available': len(formats_tested) + self._count_valid(candidates),
                             'found_on_attempt': len(formats_tested),
+                            'api_calls': api_calls,
                             'api_result': result
                         }
-                
-                # Add delay between requests to avoid rate limiting
-                if i < len(email_formats) - 1:
-                    time.sleep(API_CONFIG['delay_between_requests'])
+                        self.result_store.set(store_key, found, CACHE_CONFIG['found_ttl_seconds'])
+                        return found
+                    
+                    # Every other candidate shares this domain; stop here, and let only a fresh
+                    # reply count against the domain since a cached one was counted already
+                    if result.get('mx_accepts_mail') is False:
+                        if not result.get('cached'):
+                            self._record_dead_domain_signal(domain)
+                        stopped_on_mx = True
+                        break
+                else:
+                    lookup_failed = True
                     
             except Exception as e:
                 logger.error(f"API error for {email}: {str(e)}")
+                lookup_failed = True
                 continue
         
         # No valid email found after testing all formats
-        return {
+        not_found = {
             'firstname': firstname,
             'lastname': lastname,
             'company': domain,
@@ -381,78 +668,385 @@ class EmailVerifier:
             'status': 'not_found',
             'full_name': full_name,
             'formats_tested': formats_tested,
-            'total_formats_available': len(email_formats),
-            'found_on_attempt': len(email_formats),  # Used all attempts
+            'total_formats_available': len(formats_tested) + self._count_valid(candidates),
+            'found_on_attempt': len(formats_tested),  # Used all attempts
+            'api_calls': api_calls,
             'error': 'No valid email found in any format'
         }
+        # Only a clean miss is remembered, and briefly; API failures, searches cut short by
+        # a possibly transient MX rejection and people skipped without a lookup are retried
+        if formats_tested and not lookup_failed and not stopped_on_mx:
+            self.result_store.set(store_key, not_found, CACHE_CONFIG['not_found_ttl_seconds'])
+        return not_found
+    
+    @staticmethod
+    def _count_valid(candidates: Iterator[Tuple[str, str]]) -> int:
+        """Drain the remaining candidates, counting the addresses that would have been tried."""
+        return sum(1 for _, email in candidates if validate_email(email))
+    
+    def _is_dead_domain(self, domain: str) -> bool:
+        """Whether domain is currently skipped, dropping the mark once it expires."""
+        with self._cache_lock:
+            expires_at = self._dead_domains.get(domain)
+            if expires_at is None:
+                return False
+            if expires_at > time.time():
+                return True
+            del self._dead_domains[domain]
+            return False
+    
+    def _record_dead_domain_signal(self, domain: str):
+        """Count one "mail not accepted" answer for domain and mark it dead after enough of them."""
+        with self._cache_lock:
+            self._dead_domain_strikes[domain] += 1
+            if self._dead_domain_strikes[domain] >= CACHE_CONFIG['dead_domain_strikes']:
+                del self._dead_domain_strikes[domain]
+                self._dead_domains[domain] = time.time() + CACHE_CONFIG['dead_domain_ttl_seconds']
+    
+    def verify_batch(self, rows: List[Tuple[str, str, str]], max_workers: int = API_CONFIG['max_workers']) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Verify (firstname, lastname, company_url) rows concurrently, yielding (row position, result) as each completes."""
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(self.verify_single_email, *row): position
+                for position, row in enumerate(rows)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Don't block on queued rows if the caller stops consuming early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+@st.cache_resource
+def get_verifier(api_key: str) -> EmailVerifier:
+    """Return one verifier per API key so its session pool and caches survive reruns."""
+    return EmailVerifier(api_key)
+
+# ========================================
+# BACKGROUND VERIFICATION
+# ========================================
+
+class VerificationJob:
+    """Run a bulk verification on a worker thread so Streamlit reruns don't restart it."""
+    
+    def __init__(self, verifier: EmailVerifier, rows: List[Tuple[str, str, str]], max_workers: int):
+        self.verifier = verifier
+        self.rows = rows
+        self.max_workers = max_workers
+        self.total = len(rows)
+        self.completed = 0
+        self.total_api_calls = 0
+        self.found: Dict[int, Dict[str, Any]] = {}
+        self.found_attempts: List[int] = []
+        self.last_person: Optional[int] = None
+        self.error: Optional[str] = None
+        self.done = False
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self) -> 'VerificationJob':
+        """Start the worker thread and return self."""
+        self._thread.start()
+        return self
+    
+    def cancel(self):
+        """Stop after the people already in flight; queued people are dropped."""
+        self._cancelled.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of the progress counters for rendering."""
+        with self._lock:
+            return {
+                'completed': self.completed,
+                'total_api_calls': self.total_api_calls,
+                'found_count': len(self.found),
+                'last_person': self.last_person
+            }
+    
+    def _run(self):
+        batch = self.verifier.verify_batch(self.rows, max_workers=self.max_workers)
+        try:
+            for person, result in batch:
+                if self._cancelled.is_set():
+                    break
+                with self._lock:
+                    self._record(person, result)
+        except Exception as e:
+            logger.error(f"Bulk verification failed: {e}")
+            self.error = str(e)
+        finally:
+            batch.close()
+            self.done = True
+    
+    def _record(self, person: int, result: Optional[Dict[str, Any]]):
+        self.completed += 1
+        self.last_person = person
+        if result is None:
+            return
+        
+        found_attempt = result.get('found_on_attempt', 0)
+        # Only requests that actually reached the API count, not in-memory or stored answers
+        self.total_api_calls += result.get('api_calls', 0)
+        
+        if result.get('email'):
+            self.found[person] = {
+                'company': result['company'],
+                'email': result['email'],
+                'status': result['status']
+            }
+            self.found_attempts.append(found_attempt)
 
 # ========================================
 # DATA PROCESSING FUNCTIONS
 # ========================================
 
+def _read_csv_bytes(file_bytes: bytes) -> pd.DataFrame:
+    """Parse CSV bytes as text with pyarrow, falling back to the C parser for non-UTF-8 files."""
+    # Every field is read verbatim: "02134", "1.50" and "true" must keep their exact text,
+    # so no engine may infer a type first. Only empty cells become missing.
+    string_dtype = pd.api.types.pandas_dtype(CSV_CONFIG['string_dtype'])
+    try:
+        # Take the header from the C parser so blank and repeated names are renamed exactly
+        # as in the fallback ("Unnamed: 1", "Name.1")
+        header = list(pd.read_csv(io.BytesIO(file_bytes), nrows=0, encoding='utf-8').columns)
+        table = pa_csv.read_csv(
+            io.BytesIO(file_bytes),
+            read_options=pa_csv.ReadOptions(column_names=header, skip_rows=1),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+                strings_can_be_null=True,
+                null_values=['']
+            )
+        )
+        return table.to_pandas(types_mapper={pa.string(): string_dtype}.get)
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.info(f"pyarrow CSV parse failed, falling back to default engine: {e}")
+    
+    for encoding in CSV_CONFIG['fallback_encodings']:
+        try:
+            return pd.read_csv(
+                io.BytesIO(file_bytes), encoding=encoding, dtype=string_dtype,
+                keep_default_na=False, na_values=['']
+            )
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("Unable to decode CSV file")
+
+def _read_excel_bytes(file_bytes: bytes) -> pd.DataFrame:
+    """Parse xlsx bytes with the Rust calamine reader, falling back to openpyxl."""
+    string_dtype = CSV_CONFIG['string_dtype']
+    try:
+        return pd.read_excel(io.BytesIO(file_bytes), engine='calamine', dtype=string_dtype)
+    except (ImportError, ValueError) as e:
+        logger.info(f"calamine Excel parse failed, falling back to openpyxl: {e}")
+    return pd.read_excel(io.BytesIO(file_bytes), dtype=string_dtype)
+
+def _parquet_cache_path(file_hash: str, reader_version: int) -> Optional[str]:
+    """Location of the columnar copy of an upload, or None when the cache is disabled."""
+    cache_dir = CSV_CONFIG['parquet_cache_dir']
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"{file_hash}.v{reader_version}.parquet")
+
+def _evict_parquet_cache(cache_dir: str):
+    """Drop cached uploads past their max age, then the oldest until the directory fits its size cap."""
+    now = time.time()
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.name.endswith('.parquet'):
+            continue
+        stat = entry.stat()
+        if now - stat.st_mtime > CSV_CONFIG['parquet_cache_max_age_seconds']:
+            os.remove(entry.path)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CSV_CONFIG['parquet_cache_max_bytes']:
+            break
+        os.remove(path)
+        total -= size
+
+def _write_parquet_cache(df: pd.DataFrame, path: str):
+    """Persist a parsed upload so re-uploads of the same file skip parsing."""
+    tmp_path = None
+    try:
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # A unique, owner-only temp file keeps concurrent sessions from clobbering each other
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp', delete=False) as tmp:
+            tmp_path = tmp.name
+        df.to_parquet(tmp_path, compression='zstd', index=False)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        _evict_parquet_cache(cache_dir)
+    except Exception as e:
+        logger.warning(f"Could not cache upload as parquet: {e}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+@st.cache_data(
+    show_spinner=False,
+    max_entries=CSV_CONFIG['memory_cache_max_entries'],
+    ttl=CSV_CONFIG['memory_cache_ttl_seconds']
+)
+def _load_uploaded_file(file_name: str, file_hash: str, reader_version: int, _file_bytes: bytes) -> pd.DataFrame:
+    """Parse an uploaded file once per content hash so widget reruns reuse the frame."""
+    cache_path = _parquet_cache_path(file_hash, reader_version)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parquet cache {cache_path}: {e}")
+    
+    if file_name.endswith('.xlsx'):
+        df = _read_excel_bytes(_file_bytes)
+    else:
+        df = _read_csv_bytes(_file_bytes)
+    
+    # Arrow-backed strings use one offsets+bytes buffer instead of a PyObject per cell
+    for col in df.select_dtypes(include='object').columns:
+        df[col] = df[col].astype(CSV_CONFIG['string_dtype'])
+    
+    if cache_path:
+        _write_parquet_cache(df, cache_path)
+    return df
+
 class DataProcessor:
     """Handle CSV data processing and validation."""
     
     @staticmethod
-    def load_csv_file(uploaded_file) -> pd.DataFrame:
+    def file_digest(uploaded_file) -> str:
+        """Content hash identifying an upload across reruns and re-uploads."""
+        return _content_digest(uploaded_file.getvalue())
+    
+    @staticmethod
+    def load_csv_file(uploaded_file, file_hash: Optional[str] = None) -> pd.DataFrame:
         """Load and validate CSV/Excel file."""
         try:
-            if uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_file)
-            else:
-                df = pd.read_csv(uploaded_file)
-            return df
+            file_bytes = uploaded_file.getvalue()
+            file_hash = file_hash or _content_digest(file_bytes)
+            return _load_uploaded_file(
+                uploaded_file.name, file_hash, CSV_CONFIG['reader_version'], file_bytes
+            )
         except Exception as e:
             logger.error(f"Failed to load file {uploaded_file.name}: {e}")
             raise
     
     @staticmethod
-    def clean_dataframe(df: pd.DataFrame, column_mapping: Dict[str, str]) -> pd.DataFrame:
-        """Clean DataFrame by removing null values and empty strings using mapped columns."""
-        # Create a copy with only the mapped columns
+    def strip_mapped_columns(df: pd.DataFrame, column_mapping: Dict[str, str]) -> pd.DataFrame:
+        """Select the mapped columns under their standard names with whitespace stripped."""
         mapped_columns = list(column_mapping.values())
-        df_mapped = df[mapped_columns].copy()
-        
-        # Rename columns to standard names
         reverse_mapping = {v: k for k, v in column_mapping.items()}
-        df_mapped = df_mapped.rename(columns=reverse_mapping)
-        
-        # Remove rows with null values in required columns
         required_fields = list(REQUIRED_FIELDS.keys())
-        df_clean = df_mapped.dropna(subset=required_fields).copy()
-        
-        # Remove rows with empty strings
-        for col in required_fields:
-            df_clean = df_clean[df_clean[col].astype(str).str.strip() != '']
-        
-        return df_clean
+        return df[mapped_columns].rename(columns=reverse_mapping)[required_fields].apply(
+            lambda col: col.astype(CSV_CONFIG['string_dtype']).str.strip()
+        )
     
     @staticmethod
-    def get_data_stats(df: pd.DataFrame, column_mapping: Dict[str, str] = None) -> Dict[str, int]:
-        """Get statistics about the DataFrame."""
-        total_rows = len(df)
-        
-        if column_mapping:
-            # Check validity based on mapped columns
-            mapped_columns = list(column_mapping.values())
-            df_subset = df[mapped_columns]
-            valid_rows = len(df_subset.dropna())
-        else:
-            # Original logic for unmapped data
-            valid_rows = total_rows
-            
-        null_rows = total_rows - valid_rows
-        
-        return {
-            'total_rows': total_rows,
-            'valid_rows': valid_rows,
-            'null_rows': null_rows
-        }
+    def compute_valid_mask(stripped: pd.DataFrame) -> pd.Series:
+        """Rows where every required field is present and non-blank."""
+        return stripped.fillna('').ne('').all(axis=1)
+    
+    @staticmethod
+    def clean_dataframe(df: pd.DataFrame, column_mapping: Dict[str, str]) -> pd.DataFrame:
+        """Clean DataFrame by removing null values and empty strings using mapped columns."""
+        stripped = DataProcessor.strip_mapped_columns(df, column_mapping)
+        return stripped[DataProcessor.compute_valid_mask(stripped)]
+    
+    @staticmethod
+    def clean_domains(company_urls: pd.Series) -> pd.Series:
+        """Clean each distinct company URL once and map the result back onto every row."""
+        unique_urls = company_urls.drop_duplicates()
+        domain_map = dict(zip(unique_urls, unique_urls.map(EmailVerifier.clean_domain)))
+        return company_urls.map(domain_map)
+    
+    @staticmethod
+    def group_duplicate_people(df_clean: pd.DataFrame, domains: pd.Series) -> Tuple[Any, List[int]]:
+        """Group rows by case-insensitive (firstname, lastname, domain); return per-row group codes and each group's first row position."""
+        person_keys = (
+            df_clean['firstname'].str.lower() + '|'
+            + df_clean['lastname'].str.lower() + '|'
+            + domains.astype(CSV_CONFIG['string_dtype'])
+        )
+        codes, _ = pd.factorize(person_keys)
+        first_positions = pd.Series(codes).drop_duplicates().index.tolist()
+        return codes, first_positions
+    
+    @staticmethod
+    def get_column_summary(df: pd.DataFrame) -> pd.DataFrame:
+        """Summarize dtype, null count and sample values for every column."""
+        samples = df.head(3).agg(lambda s: ', '.join(s.dropna().astype(str)))
+        return pd.DataFrame({
+            'Column': df.columns,
+            'Type': df.dtypes.astype(str).to_numpy(),
+            'Nulls': df.isna().sum().to_numpy(),
+            'Sample': samples.to_numpy()
+        })
+    
+    @staticmethod
+    def columns_to_csv(columns: Dict[str, Any]) -> str:
+        """Serialize equal-length result columns to CSV text without building a DataFrame."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*columns.values()))
+        return buffer.getvalue()
 
 # ========================================
 # COLUMN MAPPING FUNCTIONS
 # ========================================
 
+def _score_columns(df: pd.DataFrame, pattern: str) -> pd.Series:
+    """Fraction of sampled non-null values per column matching pattern, one vectorized pass per column."""
+    sample = df.head(DETECTION_CONFIG['sample_rows'])
+    scores = sample.apply(
+        lambda col: col.astype(CSV_CONFIG['string_dtype']).str.strip().str.contains(pattern, case=False, regex=True).mean()
+    )
+    return scores.dropna()
+
+def detect_url_column(df: pd.DataFrame) -> Optional[str]:
+    """Return the column whose values look most like company URLs/domains."""
+    scores = _score_columns(df, DETECTION_CONFIG['url_pattern'])
+    scores = scores[scores >= DETECTION_CONFIG['min_score']]
+    if scores.empty:
+        return None
+    hints = DETECTION_CONFIG['header_hints']['companyURL']
+    hinted = [any(hint in str(col).lower() for hint in hints) for col in scores.index]
+    return (scores + DETECTION_CONFIG['header_bonus'] * pd.Series(hinted, index=scores.index)).idxmax()
+
+def detect_name_column(df: pd.DataFrame, hints: Tuple[str, ...]) -> Optional[str]:
+    """Return the best name-like column among those whose header matches a hint."""
+    candidates = [col for col in df.columns if any(hint in str(col).lower() for hint in hints)]
+    if not candidates:
+        return None
+    scores = _score_columns(df[candidates], DETECTION_CONFIG['name_pattern'])
+    if scores.empty or scores.max() < DETECTION_CONFIG['min_score']:
+        return None
+    return scores.idxmax()
+
+def suggest_column_mapping(df: pd.DataFrame) -> Dict[str, str]:
+    """Suggest a distinct column for each required field, skipping fields with no confident match."""
+    hints = DETECTION_CONFIG['header_hints']
+    suggestions = {
+        'firstname': detect_name_column(df, hints['firstname']),
+        'lastname': detect_name_column(df, hints['lastname']),
+        'companyURL': detect_url_column(df)
+    }
+    
+    mapping = {}
+    for field, col in suggestions.items():
+        if col is not None and col not in mapping.values():
+            mapping[field] = col
+    return mapping
+
 def render_column_mapping_interface(df: pd.DataFrame) -> Dict[str, str]:
     """Clean column mapping interface."""
     st.subheader("🔗 Column Mapping")
@@ -461,6 +1055,10 @@ def render_column_mapping_interface(df: pd.DataFrame) -> Dict[str, str]:
     available_columns = [''] + list(df.columns)
     column_mapping = {}
     
+    # Pre-select detected columns; the user can still override each choice
+    suggested = suggest_column_mapping(df)
+    default_index = {field: available_columns.index(col) for field, col in suggested.items()}
+    
     # Create clean 3-column layout
     col1, col2, col3 = st.columns(3)
     
@@ -469,6 +1067,7 @@ def render_column_mapping_interface(df: pd.DataFrame) -> Dict[str, str]:
         firstname_col = st.selectbox(
             "Select column",
             available_columns,
+            index=default_index.get('firstname', 0),
             key="firstname_mapping",
             label_visibility="collapsed"
         )
@@ -481,6 +1080,7 @@ def render_column_mapping_interface(df: pd.DataFrame) -> Dict[str, str]:
         lastname_col = st.selectbox(
             "Select column", 
             available_columns,
+            index=default_index.get('lastname', 0),
             key="lastname_mapping",
             label_visibility="collapsed"
         )
@@ -493,6 +1093,7 @@ def render_column_mapping_interface(df: pd.DataFrame) -> Dict[str, str]:
         company_col = st.selectbox(
             "Select column",
             available_columns,
+            index=default_index.get('companyURL', 0),
             key="company_mapping",
             label_visibility="collapsed"
         )
@@ -505,17 +1106,14 @@ def render_column_mapping_interface(df: pd.DataFrame) -> Dict[str, str]:
 def render_mapped_data_preview(df: pd.DataFrame, column_mapping: Dict[str, str]):
     """Clean data preview."""
     if len(column_mapping) == 3:
-        # Create preview with mapped columns
+        # Slice the preview rows first so only 10 rows are selected and renamed
         mapped_columns = list(column_mapping.values())
-        preview_df = df[mapped_columns].copy()
-        
-        # Rename for display
         display_mapping = {v: REQUIRED_FIELDS[k] for k, v in column_mapping.items()}
-        preview_df = preview_df.rename(columns=display_mapping)
+        preview_df = df.head(10)[mapped_columns].rename(columns=display_mapping)
         
         # Show preview in clean format
         with st.expander("📋 Data Preview", expanded=False):
-            st.dataframe(preview_df.head(10), use_container_width=True)
+            st.dataframe(preview_df, use_container_width=True)
         
         return True
     return False
@@ -642,31 +1240,124 @@ class UIRenderer:
     @staticmethod
     def render_efficiency_insights(results_df: pd.DataFrame):
         """Render algorithm efficiency insights."""
-        st.subheader("⚡ Algorithm Efficiency")
-        
-        attempt_counts = results_df['found_on_attempt'].value_counts().sort_index()
+        attempts = results_df['found_on_attempt'].to_numpy(dtype=np.int64)
+        counts = np.bincount(attempts)
+        found_attempts = np.flatnonzero(counts)
         
         col1, col2 = st.columns(2)
         with col1:
-            st.write("**Emails found by attempt number:**")
-            for attempt, count in attempt_counts.items():
-                st.write(f"• Attempt {attempt}: {count} emails")
+            lines = ["**Emails found by attempt number:**"]
+            lines.extend(f"• Attempt {attempt}: {counts[attempt]} emails" for attempt in found_attempts)
+            st.markdown("  \n".join(lines))
         
         with col2:
-            first_attempt_success = len(results_df[results_df['found_on_attempt'] == 1])
-            first_attempt_rate = (first_attempt_success / len(results_df) * 100) if len(results_df) > 0 else 0
+            first_attempt_success = int(counts[1]) if len(counts) > 1 else 0
+            first_attempt_rate = (first_attempt_success / len(attempts) * 100) if len(attempts) > 0 else 0
             st.metric("First Attempt Success", f"{first_attempt_rate:.1f}%")
             
-            avg_attempts = results_df['found_on_attempt'].mean()
+            avg_attempts = attempts.mean() if len(attempts) > 0 else 0
             st.metric("Avg Attempts to Find", f"{avg_attempts:.1f}")
 
 # ========================================
 # TAB CONTENT RENDERERS
 # ========================================
 
+@st.fragment(run_every=UI_CONFIG['progress_update_seconds'])
+def render_bulk_progress(bulk_run: Dict[str, Any]):
+    """Poll the background job; only this fragment reruns while it is working."""
+    job = bulk_run['job']
+    if job.done:
+        # One full rerun swaps this polling fragment for the static results
+        st.rerun()
+    
+    progress = job.snapshot()
+    completed = progress['completed']
+    found_count = progress['found_count']
+    rate = (found_count / completed * 100) if completed else 0
+    total_rows = len(bulk_run['person_codes'])
+    
+    # One status block per tick instead of separate progress, text and metric slots
+    label = (f"Verifying emails… {completed}/{job.total} • {progress['total_api_calls']} API calls • "
+             f"{found_count} found ({rate:.1f}%)")
+    with st.status(label, expanded=True):
+        st.progress(completed / job.total if job.total else 1.0)
+        if progress['last_person'] is not None:
+            position = bulk_run['unique_positions'][progress['last_person']]
+            st.caption(f"Last processed: {bulk_run['firstnames'][position]} {bulk_run['lastnames'][position]}")
+        if job.total < total_rows:
+            st.caption(f"{total_rows - job.total} duplicate rows will reuse earlier results")
+    
+    if job.cancelled:
+        st.info("Stopping after the requests already in flight...")
+    elif st.button("⏹️ Stop Verification", use_container_width=True):
+        job.cancel()
+
+def render_bulk_results(bulk_run: Dict[str, Any], processor: 'DataProcessor'):
+    """Render the finished (or stopped) background job's results."""
+    job = bulk_run['job']
+    person_codes = bulk_run['person_codes']
+    total_rows = len(person_codes)
+    
+    if job.error:
+        st.error(f"Verification failed: {job.error}")
+    elif job.cancelled:
+        st.warning(f"⏹️ Verification stopped after {job.completed}/{job.total} people")
+    else:
+        st.progress(1.0)
+        st.success("✅ Verification completed!")
+    
+    # Expand results back onto every input row, in input order, column by column
+    positions = np.flatnonzero(np.isin(person_codes, list(job.found)))
+    if len(positions) == 0:
+        st.warning("No emails found")
+        return
+    
+    found = [job.found[code] for code in person_codes[positions]]
+    results = {
+        'firstname': bulk_run['firstnames'][positions],
+        'lastname': bulk_run['lastnames'][positions],
+        'company': [person['company'] for person in found],
+        'email': [person['email'] for person in found],
+        'status': [person['status'] for person in found]
+    }
+    
+    st.subheader("📋 Results")
+    st.dataframe(pd.DataFrame(results), use_container_width=True)
+    
+    # Download
+    st.download_button(
+        "📥 Download Results",
+        data=processor.columns_to_csv(results),
+        file_name=f"verified_emails_{time.strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+        type="primary",
+        use_container_width=True
+    )
+    
+    # Analytics are opt-in for large runs
+    show_analytics = st.checkbox(
+        "📊 Show detailed analytics",
+        value=total_rows < UI_CONFIG['analytics_default_max_rows']
+    )
+    if not show_analytics:
+        return
+    
+    # Stats in expander
+    with st.expander("📊 Detailed Statistics"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Processed", total_rows)
+        with col2:
+            st.metric("Success Rate", f"{(len(positions)/total_rows*100):.1f}%")
+        with col3:
+            st.metric("Avg API Calls", f"{job.total_api_calls/total_rows:.1f}")
+    
+    with st.expander("⚡ Algorithm Efficiency"):
+        UIRenderer.render_efficiency_insights(pd.DataFrame({'found_on_attempt': job.found_attempts}))
+
 def render_csv_upload_tab(api_key: str):
     """Clean CSV upload tab with professional layout."""
-    verifier = EmailVerifier(api_key)
+    verifier = get_verifier(api_key)
     processor = DataProcessor()
     
     # File upload section
@@ -691,7 +1382,8 @@ def render_csv_upload_tab(api_key: str):
     if uploaded_file is not None:
         try:
             # Load file
-            df = processor.load_csv_file(uploaded_file)
+            file_hash = processor.file_digest(uploaded_file)
+            df = processor.load_csv_file(uploaded_file, file_hash)
             
             # File info
             col1, col2, col3 = st.columns(3)
@@ -701,14 +1393,13 @@ def render_csv_upload_tab(api_key: str):
                 st.metric("Columns", len(df.columns))
             with col3:
                 with st.expander("View Columns"):
-                    for col in df.columns:
-                        st.write(f"• {col}")
+                    st.dataframe(processor.get_column_summary(df), use_container_width=True, hide_index=True)
             
             # Column mapping
             column_mapping = render_column_mapping_interface(df)
             
             # Validate mapping
-            is_mapping_valid, mapping_errors = validate_column_mapping(column_mapping, df.columns.tolist())
+            is_mapping_valid, mapping_errors = validate_column_mapping(column_mapping, df.columns)
             
             if not is_mapping_valid:
                 st.error("Please complete column mapping")
@@ -729,108 +1420,67 @@ def render_csv_upload_tab(api_key: str):
             with col1:
                 st.metric("Ready to Process", len(df_clean))
             with col2:
+                max_workers = st.slider(
+                    "Parallel workers",
+                    min_value=1,
+                    max_value=verifier.pool_size,
+                    value=API_CONFIG['max_workers'],
+                    help="Rows verified at the same time; the API rate limit still applies"
+                )
                 start_btn = st.button("🚀 Start Verification", type="primary", use_container_width=True)
             
+            # Runs are kept per file content and column mapping, so reruns and re-uploads show
+            # earlier results but a remapped file never shows results for other columns
+            bulk_runs = st.session_state.setdefault('bulk_runs', {})
+            run_key = (file_hash, *(column_mapping[field] for field in REQUIRED_FIELDS))
             if start_btn:
-                # Progress tracking
-                progress_bar = st.progress(0)
-                status_text = st.empty()
+                # One live job per file: a new start replaces any run still in flight for it
+                for key, previous_run in bulk_runs.items():
+                    if key[0] == file_hash and not previous_run['job'].done:
+                        previous_run['job'].cancel()
                 
-                # Results containers
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    calls_metric = st.empty()
-                with col2:
-                    found_metric = st.empty()
-                with col3:
-                    rate_metric = st.empty()
+                # Columns are already stripped by clean_dataframe; iterate plain arrays
+                domains = processor.clean_domains(df_clean['companyURL'])
                 
-                results_container = st.container()
+                # URLs that clean to nothing can never verify; report them once, skip them
+                no_domain = domains.eq('').to_numpy()
+                skipped_rows = df_clean[no_domain]
+                df_clean = df_clean[~no_domain]
+                domains = domains[~no_domain]
                 
-                verified_emails = []
-                total_rows = len(df_clean)
-                total_api_calls = 0
+                person_codes, unique_positions = processor.group_duplicate_people(df_clean, domains)
+                firstnames = df_clean['firstname'].to_numpy()
+                lastnames = df_clean['lastname'].to_numpy()
+                domains = domains.to_numpy()
                 
-                # Process each row
-                for index, row in df_clean.iterrows():
-                    progress = (index + 1) / total_rows
-                    progress_bar.progress(progress)
-                    status_text.text(f"Processing {index + 1}/{total_rows}: {row['firstname']} {row['lastname']}")
-                    
-                    # Verify email
-                    result = verifier.verify_single_email(
-                        str(row['firstname']).strip(),
-                        str(row['lastname']).strip(), 
-                        str(row['companyURL']).strip()
-                    )
-                    
-                    if result is not None:
-                        found_attempt = result.get('found_on_attempt', 0)
-                        total_formats = result.get('total_formats_available', 0)
-                        api_calls_used = found_attempt if found_attempt > 0 else total_formats
-                        total_api_calls += api_calls_used
-                        
-                        if result.get('email'):
-                            verified_emails.append({
-                                'firstname': result['firstname'],
-                                'lastname': result['lastname'],
-                                'company': result['company'],
-                                'email': result['email'],
-                                'status': result['status']
-                            })
-                            
-                            with results_container:
-                                st.success(f"✅ {result['email']}")
-                    
-                    # Update metrics
-                    calls_metric.metric("API Calls", total_api_calls)
-                    found_metric.metric("Emails Found", len(verified_emails))
-                    if index + 1 > 0:
-                        rate = (len(verified_emails) / (index + 1)) * 100
-                        rate_metric.metric("Success Rate", f"{rate:.1f}%")
-                
-                # Complete
-                progress_bar.progress(1.0)
-                status_text.success("✅ Verification completed!")
-                
-                # Results
-                if verified_emails:
-                    st.subheader("📋 Results")
-                    results_df = pd.DataFrame(verified_emails)
-                    st.dataframe(results_df, use_container_width=True)
-                    
-                    # Download
-                    csv_buffer = io.StringIO()
-                    results_df.to_csv(csv_buffer, index=False)
-                    csv_data = csv_buffer.getvalue()
-                    
-                    st.download_button(
-                        "📥 Download Results",
-                        data=csv_data,
-                        file_name=f"verified_emails_{time.strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv",
-                        type="primary",
-                        use_container_width=True
-                    )
-                    
-                    # Stats in expander
-                    with st.expander("📊 Detailed Statistics"):
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Total Processed", total_rows)
-                        with col2:
-                            st.metric("Success Rate", f"{(len(verified_emails)/total_rows*100):.1f}%")
-                        with col3:
-                            st.metric("Avg API Calls", f"{total_api_calls/total_rows:.1f}")
+                # Verify each distinct person once; duplicate rows share the result
+                rows = [(firstnames[p], lastnames[p], domains[p]) for p in unique_positions]
+                bulk_runs[run_key] = {
+                    'job': VerificationJob(verifier, rows, max_workers).start(),
+                    'person_codes': person_codes,
+                    'unique_positions': unique_positions,
+                    'firstnames': firstnames,
+                    'lastnames': lastnames,
+                    'skipped_rows': skipped_rows
+                }
+            
+            bulk_run = bulk_runs.get(run_key)
+            if bulk_run is not None:
+                skipped_rows = bulk_run['skipped_rows']
+                if len(skipped_rows):
+                    with st.expander(f"⚠️ {len(skipped_rows)} rows skipped: no usable company domain"):
+                        st.dataframe(skipped_rows, use_container_width=True)
+                if bulk_run['job'].done:
+                    render_bulk_results(bulk_run, processor)
                 else:
-                    st.warning("No emails found")
+                    render_bulk_progress(bulk_run)
                     
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
 def render_single_entry_tab(api_key: str):
     """Clean single entry tab with professional layout."""
-    verifier = EmailVerifier(api_key)
+    verifier = get_verifier(api_key)
     
     # Input form in columns
     col1, col2 = st.columns(2)
@@ -847,7 +1497,7 @@ def render_single_entry_tab(api_key: str):
         verify_btn = st.button("🔍 Verify Email", type="primary", use_container_width=True)
     
     if verify_btn:
-        if not all([firstname, lastname, company_url]):
+        if not (firstname and lastname and company_url):
             st.error("Please fill all fields")
             return
         
@@ -881,16 +1531,12 @@ def render_single_entry_tab(api_key: str):
                     st.metric("Efficiency", f"{saved:.0f}%")
             
             # Download single result
-            single_df = pd.DataFrame([{
-                'firstname': result['firstname'],
-                'lastname': result['lastname'],
-                'email': result['email'],
-                'status': result['status']
-            }])
-            
-            csv_buffer = io.StringIO()
-            single_df.to_csv(csv_buffer, index=False)
-            csv_data = csv_buffer.getvalue()
+            csv_data = DataProcessor.columns_to_csv({
+                'firstname': [result['firstname']],
+                'lastname': [result['lastname']],
+                'email': [result['email']],
+                'status': [result['status']]
+            })
             
             st.download_button(
                 "📥 Download Result",
@@ -903,11 +1549,11 @@ def render_single_entry_tab(api_key: str):
             # Details in expander
             with st.expander("🔍 Format Details"):
                 tested_formats = result.get('formats_tested', [])
-                for i, email_format in enumerate(tested_formats, 1):
-                    if email_format == result['email']:
-                        st.success(f"{i}. {email_format} ✅")
-                    else:
-                        st.text(f"{i}. {email_format} ❌")
+                lines = [
+                    f"{i}. {email_format} {'✅' if email_format == result['email'] else '❌'}"
+                    for i, email_format in enumerate(tested_formats, 1)
+                ]
+                st.code("\n".join(lines), language="text")
                         
         else:
             # Not found
@@ -920,8 +1566,7 @@ def render_single_entry_tab(api_key: str):
             if result:
                 with st.expander("📋 Formats Tested"):
                     tested_formats = result.get('formats_tested', [])
-                    for i, email_format in enumerate(tested_formats, 1):
-                        st.text(f"{i}. {email_format}")
+                    st.code("\n".join(f"{i}. {email_format}" for i, email_format in enumerate(tested_formats, 1)), language="text")
 
 # ========================================
 # MAIN APPLICATION
@@ -933,10 +1578,8 @@ def main():
     st.set_page_config(**PAGE_CONFIG)
     
     # Session state
-    if 'api_key' not in st.session_state:
-        st.session_state.api_key = None
-    if 'api_key_validated' not in st.session_state:
-        st.session_state.api_key_validated = False
+    st.session_state.setdefault('api_key', None)
+    st.session_state.setdefault('api_key_validated', False)
     
     # CSS
     load_custom_css()
@@ -955,7 +1598,8 @@ def main():
     renderer = UIRenderer()
     api_key = renderer.render_sidebar()
     
-    if not api_key or not validate_api_key(api_key):
+    # The key was validated once in api_key_dialog; api_key_validated gates reruns
+    if not api_key:
         st.error("API validation failed")
         return
     
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+CSV_BYTES = (
+    b"Zip,Active,Price,First Name\n"
+    b"02134,true,1.50,Ann\n"
+    b"00501,False,2,\n"
+)
+
+
+def _arrow_unavailable(*args, **kwargs):
+    raise ValueError("force the C parser fallback")
+
+
+def _assert_verbatim(df):
+    assert df['Zip'].tolist() == ['02134', '00501']
+    assert df['Active'].tolist() == ['true', 'False']
+    assert df['Price'].tolist() == ['1.50', '2']
+    assert df['First Name'].iloc[0] == 'Ann'
+    assert df['First Name'].isna().iloc[1]
+
+
+def test_read_csv_bytes_keeps_cell_text():
+    _assert_verbatim(app._read_csv_bytes(CSV_BYTES))
+
+
+def test_read_csv_bytes_fallback_keeps_cell_text(monkeypatch):
+    monkeypatch.setattr(app.pa_csv, 'read_csv', _arrow_unavailable)
+    _assert_verbatim(app._read_csv_bytes(CSV_BYTES))
+
+
+def test_read_csv_bytes_non_utf8_falls_back():
+    df = app._read_csv_bytes("Name,Zip\nJosé,02134\n".encode('cp1252'))
+    assert df['Name'].tolist() == ['José']
+    assert df['Zip'].tolist() == ['02134']
+
+
+@pytest.mark.parametrize('header, expected', [
+    (b"Name,Name,Site", ['Name', 'Name.1', 'Site']),
+    (b"Name,,Site,", ['Name', 'Unnamed: 1', 'Site', 'Unnamed: 3']),
+    (b"A,A.1,A,A", ['A', 'A.1', 'A.2', 'A.3']),
+])
+def test_read_csv_bytes_header_matches_pandas(monkeypatch, header, expected):
+    data = header + b"\n" + b",".join([b"x"] * len(expected)) + b"\n"
+    assert list(app._read_csv_bytes(data).columns) == expected
+    monkeypatch.setattr(app.pa_csv, 'read_csv', _arrow_unavailable)
+    assert list(app._read_csv_bytes(data).columns) == expected